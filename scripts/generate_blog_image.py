@@ -18,76 +18,79 @@ Usage:
         --title "Understanding SOLID Principles" \\
         --content "Software design principles for maintainable code" \\
         --output "solid-principles.png"
+
+    # Generate images for several posts concurrently
+    python scripts/generate_blog_image.py --manifest posts.json
+
+Generated images are cached under posts/images/.cache/, keyed by the model
+and the full prompt, so re-running with identical inputs skips the API call.
+Pass --no-cache to always call the API. HuggingFace's server-side cache is
+also used for identical prompts; pass --fresh to force a brand new image.
 """
 
 import argparse
-import io
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import json
 import os
+import re
+import shutil
 import sys
+import uuid
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-try:
-    from huggingface_hub import InferenceClient
-except ImportError:
-    print("Error: huggingface_hub is not installed.")
-    print("Install it with: pip install huggingface_hub")
-    sys.exit(1)
+if TYPE_CHECKING:
+    from huggingface_hub import AsyncInferenceClient, InferenceClient
 
 try:
-    from PIL import Image
+    import fcntl
 except ImportError:
-    print("Error: Pillow is not installed.")
-    print("Install it with: pip install Pillow")
-    sys.exit(1)
+    # Not available on Windows; cache locking is skipped there
+    fcntl = None
 
 
-def validate_api_key(api_key: str) -> str:
-    """Validate and return the API key."""
-    if not api_key:
-        print("Error: HuggingFace API token not provided.")
-        print("Set HUGGINGFACE_API_KEY environment variable or pass --api-key parameter.")
-        sys.exit(1)
-    return api_key
+# Output and cache directories, resolved and created once per process
+IMAGES_DIR = Path(__file__).resolve().parent.parent / "posts" / "images"
+CACHE_DIR = IMAGES_DIR / ".cache"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Similarity cache: embeddings of previously generated subjects, one JSON object per line
+SIMILARITY_INDEX_PATH = CACHE_DIR / "index.jsonl"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
-def ensure_png_extension(filename: str) -> str:
-    """Ensure the filename has a .png extension."""
-    if not filename.endswith('.png'):
-        return f"{filename}.png"
-    return filename
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
 
+# Supported output formats: Pillow format name and encoder options. PNG uses the
+# fastest zlib level; WebP and AVIF are lossy and much smaller for blog headers.
+IMAGE_FORMATS = {
+    'png': {'pil_format': 'PNG', 'save_options': {'compress_level': 1, 'optimize': False}},
+    'webp': {'pil_format': 'WEBP', 'save_options': {'quality': 85, 'method': 4}},
+    'avif': {'pil_format': 'AVIF', 'save_options': {'quality': 85}},
+}
 
-def get_output_path(filename: str) -> Path:
-    """Get the full output path for the image file."""
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
-    output_path = repo_root / "posts" / "images" / filename
-    
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    return output_path
+# Generations can take up to a minute on a cold model, so allow well beyond that
+REQUEST_TIMEOUT_SECONDS = 120
 
+# Retry policy for transient failures (rate limits, model loading, dropped connections)
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 1.5
+RETRY_STATUS_CODES = (429, 503)
 
-def construct_image_prompt(title: str, content: str, scene: str = None) -> str:
-    """Construct the image generation prompt.
-    
-    Args:
-        title: The blog post title
-        content: Brief summary of post themes
-        scene: Optional specific scene description. If provided, this creative
-               description is used directly. If not provided, generic guidance is given.
-    """
-    style_prompt = "pseudo realistic cell-shaded style with focus and focus blur effects"
-    
-    if scene:
-        # Creative scene provided - use it directly with style requirements
-        prompt = f"""Create a tech-oriented featured image for a blog post.
+STYLE_PROMPT = "pseudo realistic cell-shaded style with focus and focus blur effects"
 
-Scene: {scene}
+# Prompt used when a creative scene description is provided
+SCENE_PROMPT_TEMPLATE = f"""Create a tech-oriented featured image for a blog post.
+
+Scene: {{scene}}
 
 Style Requirements:
-- {style_prompt}
+- {STYLE_PROMPT}
 - Modern, tech-oriented color scheme
 - Limited color palette (3-5 colors)
 - Include at least one element in sharp focus and one element with blur/depth-of-field effect
@@ -97,15 +100,15 @@ Style Requirements:
 
 Technical aesthetic: Clean, modern, minimalist with depth
 """
-    else:
-        # No scene provided - use generic guidance with examples
-        prompt = f"""Create a tech-oriented featured image for a blog post using everyday scenes or objects.
 
-Post Title: {title}
-Post Theme: {content}
+# Prompt used when no scene is provided - generic guidance with examples
+GENERIC_PROMPT_TEMPLATE = f"""Create a tech-oriented featured image for a blog post using everyday scenes or objects.
+
+Post Title: {{title}}
+Post Theme: {{content}}
 
 Style Requirements:
-- {style_prompt}
+- {STYLE_PROMPT}
 - Scene or object-based imagery: rooms, courtyards, open city/suburban spaces, OR closeup of everyday household/office items
 - Examples: red stapler on desk, keyboard with coffee cup, violin on stand, pots in kitchen sink, towel on towel rail, empty office room, urban courtyard
 - Modern, tech-oriented color scheme
@@ -117,14 +120,359 @@ Style Requirements:
 
 Technical aesthetic: Clean, modern, minimalist with depth
 """
+
+# The templates are split around their placeholders once at import time, so
+# building a prompt is a plain concatenation of constant segments and the
+# constant text is byte-identical on every run (which keeps cache keys stable)
+SCENE_PROMPT_PREFIX, SCENE_PROMPT_SUFFIX = SCENE_PROMPT_TEMPLATE.split('{scene}')
+GENERIC_PROMPT_PREFIX, GENERIC_PROMPT_MIDDLE, GENERIC_PROMPT_SUFFIX = re.split(
+    r'\{title\}|\{content\}', GENERIC_PROMPT_TEMPLATE
+)
+
+
+class ImageGenerationError(Exception):
+    """Raised when the script's inputs are invalid or an image could not be produced."""
+
+
+def validate_api_key(api_key: str) -> str:
+    """Validate and return the API key."""
+    if not api_key:
+        raise ImageGenerationError(
+            "HuggingFace API token not provided.\n"
+            "Set HUGGINGFACE_API_KEY environment variable or pass --api-key parameter."
+        )
+    return api_key
+
+
+def ensure_extension(filename: str, image_format: str = 'png') -> str:
+    """Ensure the filename has the extension for the image format.
+    
+    A different supported image extension (e.g. .png when generating WebP) is replaced.
+    """
+    stem, extension = os.path.splitext(filename)
+    if extension.lower() == f".{image_format}":
+        return filename
+    if extension.lower().lstrip('.') in IMAGE_FORMATS:
+        return f"{stem}.{image_format}"
+    return f"{filename}.{image_format}"
+
+
+def get_output_path(filename: str) -> Path:
+    """Get the full output path for the image file."""
+    return IMAGES_DIR / filename
+
+
+def get_cache_path(cache_key: str, image_format: str = 'png') -> Path:
+    """Get the path of the cached image for the given cache key and format."""
+    return CACHE_DIR / f"{cache_key}.{image_format}"
+
+
+def compute_cache_key(model: str, image_prompt: str) -> str:
+    """Compute the content-addressed cache key for a model and prompt."""
+    return hashlib.sha256((model + "\0" + image_prompt).encode('utf-8')).hexdigest()
+
+
+@contextlib.contextmanager
+def cache_lock(cache_path: Path):
+    """Hold an exclusive lock on the cache entry so concurrent runs don't double-generate."""
+    if fcntl is None:
+        yield
+        return
     
-    return prompt
+    lock_path = cache_path.with_suffix('.lock')
+    with open(lock_path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_temporary_path(destination: Path) -> Path:
+    """Get a unique hidden path next to destination for writing before an os.replace."""
+    return destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+
+
+def replace_output(destination: Path, write) -> None:
+    """Produce destination by calling write(path) on a temporary path and renaming it into place.
+    
+    An existing output may be hardlinked to a cache entry, so it must never be
+    opened for writing; replacing the directory entry leaves the cache intact.
+    """
+    temporary_path = get_temporary_path(destination)
+    try:
+        write(temporary_path)
+        os.replace(temporary_path, destination)
+    finally:
+        if temporary_path.exists():
+            temporary_path.unlink()
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hardlink source to destination, falling back to a copy."""
+    def write(temporary_path: Path) -> None:
+        try:
+            os.link(source, temporary_path)
+        except OSError:
+            shutil.copyfile(source, temporary_path)
+    
+    replace_output(destination, write)
+
+
+@functools.lru_cache(maxsize=None)
+def import_huggingface_hub():
+    """Import huggingface_hub on first use.
+    
+    The import (together with Pillow, which huggingface_hub uses to decode
+    images) takes around half a second, so it is deferred until an image is
+    actually requested. This keeps --help and argument errors fast.
+    """
+    try:
+        import huggingface_hub
+    except ImportError as e:
+        raise ImageGenerationError(
+            "huggingface_hub is not installed.\n"
+            "Install it with: pip install huggingface_hub"
+        ) from e
+    
+    try:
+        import PIL  # noqa: F401
+    except ImportError as e:
+        raise ImageGenerationError(
+            "Pillow is not installed.\n"
+            "Install it with: pip install Pillow"
+        ) from e
+    
+    return huggingface_hub
+
+
+def describe_subject(title: str, content: str, scene: str = None) -> str:
+    """Describe what an image depicts, for comparing posts in the similarity cache.
+    
+    Only the post-specific text is used; the shared style requirements in the
+    prompt would otherwise make every post look alike.
+    """
+    return scene if scene else f"{title}\n{content}"
+
+
+def check_similarity_support() -> None:
+    """Ensure numpy is available; huggingface_hub needs it to return embeddings."""
+    if importlib.util.find_spec('numpy') is None:
+        raise ImageGenerationError(
+            "numpy is required for --similarity-threshold.\n"
+            "Install it with: pip install numpy"
+        )
+
+
+def find_similar_image(embedding, model: str, image_format: str, threshold: float):
+    """Find the cached image whose subject is most similar to the embedding.
+    
+    Returns the cached image path if its cosine similarity reaches the
+    threshold, otherwise None. Index records that are malformed, come from a
+    different embedding model or have a different dimension are skipped.
+    """
+    import numpy as np
+    
+    if not SIMILARITY_INDEX_PATH.exists():
+        return None
+    
+    embeddings = []
+    paths = []
+    with open(SIMILARITY_INDEX_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if (record.get('embedding_model') != EMBEDDING_MODEL
+                    or record.get('model') != model
+                    or record.get('format') != image_format):
+                continue
+            cache_key = record.get('cache_key')
+            record_embedding = record.get('embedding')
+            if not isinstance(cache_key, str) or not isinstance(record_embedding, list):
+                continue
+            if len(record_embedding) != len(embedding):
+                continue
+            cache_path = get_cache_path(cache_key, image_format)
+            if cache_path.exists():
+                embeddings.append(record_embedding)
+                paths.append(cache_path)
+    
+    if not embeddings:
+        return None
+    
+    # Brute-force cosine similarity; the index stays small enough for one matrix product
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    query = np.asarray(embedding, dtype=np.float32)
+    scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+    best = int(np.argmax(scores))
+    
+    if scores[best] < threshold:
+        return None
+    
+    print(f"✓ Found similar cached image (similarity {scores[best]:.3f}): {paths[best]}")
+    return paths[best]
+
+
+def lookup_similar_image(
+    subject: str,
+    api_key: str,
+    model: str,
+    image_format: str,
+    threshold: float,
+    fresh: bool = False
+) -> tuple:
+    """Embed the subject and look for a similar cached image.
+    
+    Returns (embedding, similar_path). The embedding is None when the
+    similarity cache is disabled or unavailable, and similar_path is None when
+    there is no match. Failures are reported but never stop generation.
+    """
+    if threshold >= 1.0 or not subject:
+        return None, None
+    
+    try:
+        embedding = get_client(api_key, EMBEDDING_MODEL).feature_extraction(subject)
+        embedding = [float(value) for value in embedding.reshape(-1)]
+    except Exception as e:
+        print(f"⚠️  Warning: Could not compute subject embedding, skipping similarity cache: {e}")
+        return None, None
+    
+    if fresh:
+        return embedding, None
+    
+    try:
+        return embedding, find_similar_image(embedding, model, image_format, threshold)
+    except Exception as e:
+        print(f"⚠️  Warning: Could not search the similarity index, skipping similarity cache: {e}")
+        return embedding, None
+
+
+def record_embedding(embedding: list, cache_key: str, model: str, image_format: str, subject: str) -> None:
+    """Add a newly generated image to the similarity index.
+    
+    Failures are reported but never fail the generation that produced the image.
+    """
+    record = {
+        'cache_key': cache_key,
+        'model': model,
+        'format': image_format,
+        'embedding_model': EMBEDDING_MODEL,
+        'subject': subject,
+        'embedding': embedding,
+    }
+    try:
+        with cache_lock(SIMILARITY_INDEX_PATH):
+            with open(SIMILARITY_INDEX_PATH, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"⚠️  Warning: Could not update the similarity index: {e}")
+
+
+def build_http_session():
+    """Build a pooled HTTP session that retries transient rate-limit and model-loading errors."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    # Read errors are not retried: a timed-out generation would otherwise be
+    # re-sent and could hold the cache lock for several multiples of the timeout
+    retry = Retry(
+        total=RETRY_ATTEMPTS,
+        read=0,
+        backoff_factor=RETRY_BACKOFF_SECONDS,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=None,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def configure_http_backend() -> None:
+    """Install the pooled session as huggingface_hub's HTTP backend (once per process)."""
+    huggingface_hub = import_huggingface_hub()
+    
+    # Newer huggingface_hub releases don't use requests; their default HTTP client is kept
+    if importlib.util.find_spec('requests') is not None and hasattr(huggingface_hub, 'configure_http_backend'):
+        huggingface_hub.configure_http_backend(backend_factory=build_http_session)
+
+
+@functools.lru_cache(maxsize=4)
+def get_client(api_key: str, model: str, fresh: bool = False) -> 'InferenceClient':
+    """Get a shared inference client so connections are reused across calls.
+    
+    The model is pinned on the client so its endpoint is resolved once rather
+    than on every request.
+    
+    Args:
+        api_key: HuggingFace API token
+        model: Model ID to use for generation
+        fresh: Ask the provider not to return cached results
+    """
+    configure_http_backend()
+    
+    # Opt into the provider's response cache so identical prompts don't
+    # trigger a new diffusion run
+    return import_huggingface_hub().InferenceClient(
+        model=model,
+        token=api_key,
+        timeout=REQUEST_TIMEOUT_SECONDS,
+        headers={"x-use-cache": "false" if fresh else "true"}
+    )
+
+
+def construct_image_prompt(title: str, content: str, scene: str = None) -> str:
+    """Construct the image generation prompt.
+    
+    Args:
+        title: The blog post title
+        content: Brief summary of post themes
+        scene: Optional specific scene description. If provided, this creative
+               description is used directly. If not provided, generic guidance is given.
+    """
+    if scene:
+        # Creative scene provided - use it directly with style requirements
+        return SCENE_PROMPT_PREFIX + str(scene) + SCENE_PROMPT_SUFFIX
+    
+    # No scene provided - use generic guidance with examples
+    # (str() keeps non-string values working, as the earlier .format() did)
+    return GENERIC_PROMPT_PREFIX + str(title) + GENERIC_PROMPT_MIDDLE + str(content) + GENERIC_PROMPT_SUFFIX
 
 
 def validate_png(data: bytes) -> bool:
     """Validate that the data is a valid PNG file."""
-    png_signature = bytes([137, 80, 78, 71, 13, 10, 26, 10])
-    return data[:8] == png_signature
+    return data.startswith(PNG_SIGNATURE)
+
+
+def validate_image(data: bytes, image_format: str = 'png') -> bool:
+    """Validate that the data starts with the signature of the given image format."""
+    if image_format == 'webp':
+        return data[:4] == b'RIFF' and data[8:12] == b'WEBP'
+    if image_format == 'avif':
+        return data[4:8] == b'ftyp' and data[8:12] in (b'avif', b'avis')
+    return validate_png(data)
+
+
+def check_format_support(image_format: str) -> None:
+    """Ensure the installed Pillow can encode the requested image format."""
+    if image_format == 'png':
+        return
+    
+    from PIL import features
+    if not features.check(image_format):
+        raise ImageGenerationError(
+            f"The installed Pillow cannot encode {image_format.upper()} images.\n"
+            "Upgrade it with: pip install --upgrade Pillow"
+        )
 
 
 def generate_image(
@@ -133,7 +481,11 @@ def generate_image(
     output_filename: str,
     api_key: str,
     model: str = "black-forest-labs/FLUX.1-schnell",
-    scene: str = None
+    scene: str = None,
+    use_cache: bool = True,
+    fresh: bool = False,
+    image_format: str = 'png',
+    similarity_threshold: float = 1.0
 ) -> None:
     """Generate a blog post featured image using HuggingFace API.
     
@@ -144,11 +496,20 @@ def generate_image(
         api_key: HuggingFace API token
         model: Model ID to use for generation
         scene: Optional specific scene description for creative prompting
+        use_cache: Reuse a previously generated image for an identical prompt
+        fresh: Force a new image, bypassing both the local and server-side caches
+        image_format: Output image format (png, webp or avif)
+        similarity_threshold: Reuse a cached image whose subject is at least this
+            similar (cosine similarity); 1.0 disables the similarity cache
     """
     
     # Validate inputs
     api_key = validate_api_key(api_key)
-    output_filename = ensure_png_extension(output_filename)
+    import_huggingface_hub()
+    check_format_support(image_format)
+    if similarity_threshold < 1.0:
+        check_similarity_support()
+    output_filename = ensure_extension(output_filename, image_format)
     output_path = get_output_path(output_filename)
     
     print(f"Generating image for: {title}")
@@ -162,80 +523,442 @@ def generate_image(
     print(image_prompt)
     print("----------------------------------------\n")
     
+    generate_cached_image(
+        image_prompt, output_path, api_key, model, use_cache, fresh, image_format,
+        subject=describe_subject(title, content, scene),
+        similarity_threshold=similarity_threshold
+    )
+    
+    print(f"  Saved to: {output_path}")
+    print("\n✓ Image generation complete!")
+
+
+def generate_cached_image(
+    image_prompt: str,
+    output_path: Path,
+    api_key: str,
+    model: str,
+    use_cache: bool = True,
+    fresh: bool = False,
+    image_format: str = 'png',
+    subject: str = None,
+    similarity_threshold: float = 1.0,
+    generate=None
+) -> None:
+    """Produce the image for a prompt at output_path, going through the disk cache.
+    
+    Args:
+        image_prompt: The fully constructed image prompt
+        output_path: Where the final image should end up
+        api_key: HuggingFace API token
+        model: Model ID to use for generation
+        use_cache: Reuse a previously generated image for an identical prompt
+        fresh: Force a new image, bypassing both the local and server-side caches
+        image_format: Output image format (png, webp or avif)
+        subject: Post-specific description used by the similarity cache
+        similarity_threshold: Reuse a cached image whose subject is at least this
+            similar (cosine similarity); 1.0 disables the similarity cache
+        generate: Callable that writes a newly generated image to the path it is
+            given. Defaults to a blocking request_image call.
+    """
+    if generate is None:
+        def generate(target_path: Path) -> None:
+            request_image(image_prompt, target_path, api_key, model, fresh, image_format)
+    
+    if not use_cache:
+        replace_output(output_path, generate)
+        return
+    
+    cache_key = compute_cache_key(model, image_prompt)
+    cache_path = get_cache_path(cache_key, image_format)
+    with cache_lock(cache_path):
+        if cache_path.exists() and not fresh:
+            print(f"✓ Using cached image: {cache_path}")
+            source_path = cache_path
+        else:
+            embedding, source_path = lookup_similar_image(
+                subject, api_key, model, image_format, similarity_threshold, fresh
+            )
+            if source_path is None:
+                # Write to a temporary file first so a failed run never leaves a partial cache entry
+                pending_path = cache_path.with_suffix('.tmp')
+                generate(pending_path)
+                os.replace(pending_path, cache_path)
+                if embedding is not None:
+                    record_embedding(embedding, cache_key, model, image_format, subject)
+                source_path = cache_path
+        link_or_copy(source_path, output_path)
+
+
+def request_image(
+    image_prompt: str,
+    output_path: Path,
+    api_key: str,
+    model: str,
+    fresh: bool = False,
+    image_format: str = 'png'
+) -> None:
+    """Call the HuggingFace Inference API and write the resulting image.
+    
+    Args:
+        image_prompt: The fully constructed image prompt
+        output_path: Where to write the generated image
+        api_key: HuggingFace API token
+        model: Model ID to use for generation
+        fresh: Ask the provider not to return a cached result
+        image_format: Output image format (png, webp or avif)
+    """
+    print(f"Calling HuggingFace Inference API with model: {model}")
+    
+    client = get_client(api_key, model, fresh)
+    
+    # Generate the image
+    image = client.text_to_image(prompt=image_prompt)
+    
+    save_image(image, output_path, image_format)
+
+
+def save_image(image, output_path: Path, image_format: str = 'png') -> None:
+    """Write an image returned by the inference client to disk and report on it."""
+    # The client always returns a decoded PIL Image (providers may send JPEG),
+    # so it has to be re-encoded in the requested format. Encoding straight
+    # into the file avoids holding a second copy of the image in memory.
+    encoding = IMAGE_FORMATS[image_format]
+    with open(output_path, 'wb') as f:
+        image.save(f, format=encoding['pil_format'], **encoding['save_options'])
+    
+    # Verify the file exists
+    if not output_path.exists():
+        raise IOError("File was not created successfully")
+    
+    # Validate and report success
+    actual_size = output_path.stat().st_size
+    
+    print("✓ Image generated successfully!")
+    print(f"  Size: {actual_size / 1024:.2f} KB")
+    print(f"  File verified: {actual_size} bytes")
+    
+    # Validate it's a valid image of the requested format
+    with open(output_path, 'rb') as f:
+        if not validate_image(f.read(12), image_format):
+            print(f"⚠️  Warning: Generated file may not be a valid {image_format.upper()} image")
+
+
+def report_api_error(error: Exception) -> None:
+    """Print guidance for well-known HuggingFace API error conditions."""
+    error_str = str(error).lower()
+    
+    if 'unauthorized' in error_str or '401' in error_str:
+        print("")
+        print("⚠️  HuggingFace API Error: Unauthorized")
+        print("   Your API token is invalid or has expired.")
+        print("   Please generate a new token at: https://huggingface.co/settings/tokens")
+        print("")
+    elif 'model is currently loading' in error_str or '503' in error_str:
+        print("")
+        print("⚠️  HuggingFace API Error: Model Loading")
+        print("   The model is currently loading. Please wait and try again in a few moments.")
+        print("")
+    elif 'rate limit' in error_str or '429' in error_str:
+        print("")
+        print("⚠️  HuggingFace API Error: Rate Limit")
+        print("   You've exceeded the rate limit. Please wait a few minutes and try again.")
+        print("")
+
+
+def load_manifest(manifest_path: str) -> list:
+    """Load a batch manifest: a JSON list of {title, content, output, scene?} objects."""
     try:
-        print(f"Calling HuggingFace Inference API with model: {model}")
-        
-        # Initialize the inference client
-        client = InferenceClient(token=api_key)
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ImageGenerationError(f"Could not read manifest {manifest_path}: {e}") from e
+    
+    if not isinstance(entries, list):
+        raise ImageGenerationError(f"Manifest {manifest_path} must contain a JSON list of posts.")
+    
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ImageGenerationError(f"Manifest entry {index} must be an object, not {type(entry).__name__}")
         
-        # Generate the image
-        # The client returns a PIL Image object
-        image = client.text_to_image(
-            prompt=image_prompt,
-            model=model
-        )
+        missing = [key for key in ('title', 'content', 'output') if not entry.get(key)]
+        if missing:
+            raise ImageGenerationError(f"Manifest entry {index} is missing: {', '.join(missing)}")
         
-        # Convert PIL Image to bytes if needed
-        if hasattr(image, 'save'):
-            # It's a PIL Image - convert to bytes
-            buffer = io.BytesIO()
-            image.save(buffer, format='PNG')
-            image_bytes = buffer.getvalue()
-        elif isinstance(image, bytes):
-            # Already bytes
-            image_bytes = image
-        else:
-            raise ValueError(f"Unexpected image type: {type(image)}")
+        not_text = [
+            key for key in ('title', 'content', 'output', 'scene')
+            if entry.get(key) is not None and not isinstance(entry[key], str)
+        ]
+        if not_text:
+            raise ImageGenerationError(f"Manifest entry {index} must use strings for: {', '.join(not_text)}")
+    
+    return entries
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether a failed API call is worth retrying."""
+    # Timeouts are not retried, matching the read=0 policy of the sync session:
+    # re-sending a timed-out generation would hold the concurrency slot and the
+    # cache lock for several multiples of REQUEST_TIMEOUT_SECONDS. This check
+    # comes first because aiohttp's timeout errors also subclass its
+    # connection errors below.
+    timeout_error = import_huggingface_hub().InferenceTimeoutError
+    if isinstance(error, (timeout_error, asyncio.TimeoutError, TimeoutError)):
+        return False
+    if isinstance(error, ConnectionError):
+        return True
+    
+    # aiohttp errors expose .status; requests-based errors expose .response.status_code
+    status = getattr(error, 'status', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status in RETRY_STATUS_CODES:
+        return True
+    
+    # Dropped connections (e.g. a proxy closing an idle request, or a body cut
+    # off mid-transfer) surface as aiohttp client errors
+    try:
+        import aiohttp
+    except ImportError:
+        return False
+    return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+async def text_to_image_with_retry(client: 'AsyncInferenceClient', image_prompt: str):
+    """Call text_to_image, retrying transient failures with exponential backoff."""
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        try:
+            return await client.text_to_image(prompt=image_prompt)
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS or not is_transient_error(e):
+                raise
+            delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+            print(f"⚠️  Transient API error ({e}); retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+
+
+def generate_manifest_entry(
+    entry: dict,
+    api_key: str,
+    model: str,
+    use_cache: bool,
+    fresh: bool,
+    image_format: str,
+    similarity_threshold: float
+) -> bool:
+    """Generate the image for a single manifest entry on a worker thread. Returns True on success."""
+    try:
+        output_path = get_output_path(ensure_extension(entry['output'], image_format))
+        image_prompt = construct_image_prompt(entry['title'], entry['content'], entry.get('scene'))
         
-        # Save the image
-        with open(output_path, 'wb') as f:
-            f.write(image_bytes)
+        print(f"Requesting image for: {entry['title']}")
+        generate_cached_image(
+            image_prompt, output_path, api_key, model, use_cache, fresh, image_format,
+            subject=describe_subject(entry['title'], entry['content'], entry.get('scene')),
+            similarity_threshold=similarity_threshold
+        )
+    except Exception as e:
+        print(f"Failed to generate image for {entry['title']}: {e}")
+        report_api_error(e)
+        return False
+    
+    print(f"  Saved to: {output_path}")
+    return True
+
+
+async def image_writer(
+    write_queue: asyncio.Queue,
+    executor: concurrent.futures.Executor
+) -> None:
+    """Consume generated images from the queue and save them off the event loop.
+    
+    Each item is (image, target_path, image_format, done); done is resolved once
+    the file is written. A None item stops the writer. The executor must not be
+    shared with threads that can block on cache locks, or a lock holder waiting
+    for its image to be written could never get a thread.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await write_queue.get()
+        if item is None:
+            break
         
-        # Validate and report success
-        file_size_kb = len(image_bytes) / 1024
+        image, target_path, image_format, done = item
+        try:
+            await loop.run_in_executor(executor, save_image, image, target_path, image_format)
+            done.set_result(None)
+        except Exception as e:
+            done.set_exception(e)
+
+
+async def generate_manifest_entry_async(
+    client: 'AsyncInferenceClient',
+    semaphore: asyncio.Semaphore,
+    write_queue: asyncio.Queue,
+    entry_executor: concurrent.futures.Executor,
+    cache_locks: dict,
+    entry: dict,
+    api_key: str,
+    model: str,
+    use_cache: bool,
+    fresh: bool,
+    image_format: str,
+    similarity_threshold: float
+) -> bool:
+    """Generate the image for a single manifest entry. Returns True on success."""
+    loop = asyncio.get_running_loop()
+    
+    async def request(target_path: Path) -> None:
+        async with semaphore:
+            print(f"Requesting image for: {entry['title']}")
+            image = await text_to_image_with_retry(client, image_prompt)
         
-        print("✓ Image generated successfully!")
-        print(f"  Saved to: {output_path}")
-        print(f"  Size: {file_size_kb:.2f} KB")
+        # Hand the image to the writer so encoding and disk I/O overlap with
+        # other in-flight requests, then wait until it is on disk
+        done = loop.create_future()
+        await write_queue.put((image, target_path, image_format, done))
+        await done
+    
+    def generate(target_path: Path) -> None:
+        # Called from a worker thread by generate_cached_image; the request
+        # itself runs on the event loop
+        asyncio.run_coroutine_threadsafe(request(target_path), loop).result()
+    
+    try:
+        output_path = get_output_path(ensure_extension(entry['output'], image_format))
+        image_prompt = construct_image_prompt(entry['title'], entry['content'], entry.get('scene'))
         
-        # Verify the file exists
-        if output_path.exists():
-            actual_size = output_path.stat().st_size
-            print(f"  File verified: {actual_size} bytes")
-            
-            # Validate it's a valid PNG
-            if not validate_png(image_bytes):
-                print("⚠️  Warning: Generated file may not be a valid PNG image")
-        else:
-            print("Error: File was not created successfully")
-            sys.exit(1)
-            
+        # Entries sharing a cache entry take turns in-process before reaching the
+        # file lock, so at most one worker thread per cache entry ever blocks on it
+        cache_path = get_cache_path(compute_cache_key(model, image_prompt), image_format)
+        async with cache_locks[cache_path]:
+            await loop.run_in_executor(entry_executor, functools.partial(
+                generate_cached_image,
+                image_prompt, output_path, api_key, model, use_cache, fresh, image_format,
+                subject=describe_subject(entry['title'], entry['content'], entry.get('scene')),
+                similarity_threshold=similarity_threshold,
+                generate=generate
+            ))
     except Exception as e:
-        print(f"Failed to generate image: {e}")
-        
-        # Check for specific error conditions
-        error_str = str(e).lower()
-        
-        if 'unauthorized' in error_str or '401' in error_str:
-            print("")
-            print("⚠️  HuggingFace API Error: Unauthorized")
-            print("   Your API token is invalid or has expired.")
-            print("   Please generate a new token at: https://huggingface.co/settings/tokens")
-            print("")
-        elif 'model is currently loading' in error_str or '503' in error_str:
-            print("")
-            print("⚠️  HuggingFace API Error: Model Loading")
-            print("   The model is currently loading. Please wait and try again in a few moments.")
-            print("")
-        elif 'rate limit' in error_str or '429' in error_str:
-            print("")
-            print("⚠️  HuggingFace API Error: Rate Limit")
-            print("   You've exceeded the rate limit. Please wait a few minutes and try again.")
-            print("")
+        print(f"Failed to generate image for {entry['title']}: {e}")
+        report_api_error(e)
+        return False
+    
+    print(f"  Saved to: {output_path}")
+    return True
+
+
+async def generate_image_batch_async(
+    entries: list,
+    api_key: str,
+    model: str,
+    use_cache: bool,
+    fresh: bool,
+    max_concurrency: int,
+    image_format: str,
+    similarity_threshold: float
+) -> int:
+    """Generate all manifest entries concurrently. Returns the number of failures."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    cache_locks = collections.defaultdict(asyncio.Lock)
+    
+    # Entries run the cache logic on their own threads (each holds one while its
+    # request is in flight); the writer has a separate thread so it can always
+    # make progress, even when every entry thread is waiting on a cache lock
+    entry_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+    writer_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    
+    # Bounded so finished images waiting to be written don't pile up in memory
+    write_queue = asyncio.Queue(maxsize=4)
+    writer = asyncio.create_task(image_writer(write_queue, writer_executor))
+    
+    client = import_huggingface_hub().AsyncInferenceClient(
+        model=model,
+        token=api_key,
+        timeout=REQUEST_TIMEOUT_SECONDS,
+        headers={"x-use-cache": "false" if fresh else "true"}
+    )
+    try:
+        # Collect exceptions rather than propagating the first one, so no entry
+        # is still in flight (and needing the writer) when the batch shuts down
+        results = await asyncio.gather(*[
+            generate_manifest_entry_async(
+                client, semaphore, write_queue, entry_executor, cache_locks, entry, api_key, model,
+                use_cache, fresh, image_format, similarity_threshold
+            )
+            for entry in entries
+        ], return_exceptions=True)
+    finally:
+        # Entry threads may still be waiting on requests that run on this loop,
+        # so wait for them off the loop and only then stop the writer
+        await asyncio.get_running_loop().run_in_executor(None, entry_executor.shutdown)
+        await write_queue.put(None)
+        await writer
+        writer_executor.shutdown()
         
-        sys.exit(1)
+        # Older huggingface_hub releases open a session per request and have no close()
+        if hasattr(client, 'close'):
+            await client.close()
     
-    print("\n✓ Image generation complete!")
+    for entry, result in zip(entries, results):
+        if isinstance(result, BaseException):
+            print(f"Failed to generate image for manifest entry {entry!r}: {result}")
+    
+    return sum(1 for result in results if result is not True)
+
+
+def generate_image_batch(
+    entries: list,
+    api_key: str,
+    model: str = "black-forest-labs/FLUX.1-schnell",
+    use_cache: bool = True,
+    fresh: bool = False,
+    max_concurrency: int = 8,
+    image_format: str = 'png',
+    similarity_threshold: float = 1.0
+) -> None:
+    """Generate featured images for several blog posts concurrently.
+    
+    Args:
+        entries: Manifest entries with title, content, output and optional scene
+        api_key: HuggingFace API token
+        model: Model ID to use for generation
+        use_cache: Reuse previously generated images for identical prompts
+        fresh: Force new images, bypassing both the local and server-side caches
+        max_concurrency: Maximum number of in-flight API requests
+        image_format: Output image format (png, webp or avif)
+        similarity_threshold: Reuse cached images whose subject is at least this
+            similar (cosine similarity); 1.0 disables the similarity cache
+    """
+    api_key = validate_api_key(api_key)
+    import_huggingface_hub()
+    check_format_support(image_format)
+    if similarity_threshold < 1.0:
+        check_similarity_support()
+    
+    print(f"Generating {len(entries)} images with model: {model}\n")
+    
+    if importlib.util.find_spec('aiohttp') is not None:
+        failures = asyncio.run(generate_image_batch_async(
+            entries, api_key, model, use_cache, fresh, max_concurrency, image_format, similarity_threshold
+        ))
+    else:
+        # Without aiohttp the async client can't run; the blocking client releases
+        # the GIL while waiting on the network, so a thread pool overlaps requests too
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            results = list(executor.map(
+                lambda entry: generate_manifest_entry(
+                    entry, api_key, model, use_cache, fresh, image_format, similarity_threshold
+                ),
+                entries
+            ))
+        failures = results.count(False)
+    
+    if failures:
+        raise ImageGenerationError(f"{failures} of {len(entries)} images failed to generate")
+    
+    print(f"\n✓ Generated {len(entries)} images!")
 
 
 def main():
@@ -257,18 +980,19 @@ Examples:
     --title "Composition Over Inheritance" \\
     --content "Software design pattern emphasizing flexible composition" \\
     --output "composition-over-inheritance.png"
+  
+  # Several posts at once from a manifest:
+  python scripts/generate_blog_image.py --manifest posts.json
         """
     )
     
     parser.add_argument(
         '--title',
-        required=True,
         help='The title of the blog post'
     )
     
     parser.add_argument(
         '--content',
-        required=True,
         help='A summary or key themes from the blog post content'
     )
     
@@ -279,10 +1003,21 @@ Examples:
     
     parser.add_argument(
         '--output',
-        required=True,
         help='The filename for the generated image (e.g., "my-post-slug.png")'
     )
     
+    parser.add_argument(
+        '--manifest',
+        help='Path to a JSON list of {"title", "content", "output", "scene"} objects to generate concurrently instead of a single image'
+    )
+    
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=8,
+        help='Maximum number of concurrent API requests in --manifest mode (default: 8)'
+    )
+    
     parser.add_argument(
         '--api-key',
         default=os.environ.get('HUGGINGFACE_API_KEY', ''),
@@ -295,16 +1030,78 @@ Examples:
         help='HuggingFace model ID to use for image generation (default: FLUX.1-schnell)'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--format',
+        dest='image_format',
+        choices=sorted(IMAGE_FORMATS),
+        default='png',
+        help='Output image format (default: png). webp and avif produce much smaller files for the same header image'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always call the API instead of reusing a cached image for an identical prompt'
+    )
     
-    generate_image(
-        title=args.title,
-        content=args.content,
-        output_filename=args.output,
-        api_key=args.api_key,
-        model=args.model,
-        scene=args.scene
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Force a brand new image, bypassing both the local cache and the HuggingFace server-side cache'
+    )
+    
+    parser.add_argument(
+        '--similarity-threshold',
+        type=float,
+        default=1.0,
+        help='Reuse a cached image when a previous post\'s title/content/scene is at least this similar (cosine similarity, e.g. 0.92). Default: 1.0 (disabled)'
     )
+    
+    args = parser.parse_args()
+    
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    
+    if not 0.0 < args.similarity_threshold <= 1.0:
+        parser.error("--similarity-threshold must be greater than 0 and at most 1")
+    
+    if not args.manifest:
+        missing = [name for name in ('title', 'content', 'output') if not getattr(args, name)]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join('--' + name for name in missing)}")
+    
+    try:
+        if args.manifest:
+            generate_image_batch(
+                entries=load_manifest(args.manifest),
+                api_key=args.api_key,
+                model=args.model,
+                use_cache=not args.no_cache,
+                fresh=args.fresh,
+                max_concurrency=args.max_concurrency,
+                image_format=args.image_format,
+                similarity_threshold=args.similarity_threshold
+            )
+        else:
+            generate_image(
+                title=args.title,
+                content=args.content,
+                output_filename=args.output,
+                api_key=args.api_key,
+                model=args.model,
+                scene=args.scene,
+                use_cache=not args.no_cache,
+                fresh=args.fresh,
+                image_format=args.image_format,
+                similarity_threshold=args.similarity_threshold
+            )
+    except ImageGenerationError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Failed to generate image: {e}")
+        report_api_error(e)
+        sys.exit(1)
 
 
 if __name__ == '__main__':
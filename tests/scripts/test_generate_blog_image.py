@@ -0,0 +1,212 @@
+"""Tests for scripts/generate_blog_image.py manifest (batch) generation.
+
+The HuggingFace clients are replaced with fakes, so no API token or network
+access is needed.
+
+Run with: python -m unittest discover tests/scripts
+"""
+
+import asyncio
+import importlib.util
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "generate_blog_image.py"
+DEPENDENCIES = ('huggingface_hub', 'PIL', 'aiohttp')
+MISSING_DEPENDENCIES = [name for name in DEPENDENCIES if importlib.util.find_spec(name) is None]
+
+# Generous upper bound; a healthy batch of fake requests finishes in well under a second
+BATCH_TIMEOUT_SECONDS = 10
+
+
+def load_script():
+    """Import the script as a module."""
+    spec = importlib.util.spec_from_file_location("generate_blog_image", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def fake_image():
+    """Create a small image like the ones the inference client returns."""
+    from PIL import Image
+    return Image.new('RGB', (32, 32), 'teal')
+
+
+class FakeAsyncInferenceClient:
+    """Stands in for huggingface_hub.AsyncInferenceClient."""
+    
+    def __init__(self, **kwargs):
+        pass
+    
+    async def text_to_image(self, prompt):
+        await asyncio.sleep(0.05)
+        return fake_image()
+    
+    async def close(self):
+        pass
+
+
+class FakeInferenceClient:
+    """Stands in for huggingface_hub.InferenceClient."""
+    
+    def text_to_image(self, prompt):
+        return fake_image()
+
+
+@unittest.skipIf(MISSING_DEPENDENCIES, f"missing packages: {', '.join(MISSING_DEPENDENCIES)}")
+class ManifestGenerationTests(unittest.TestCase):
+    
+    def setUp(self):
+        self.module = load_script()
+        self.images_dir = Path(tempfile.mkdtemp())
+        cache_dir = self.images_dir / ".cache"
+        cache_dir.mkdir()
+        
+        for name, value in (
+            ('IMAGES_DIR', self.images_dir),
+            ('CACHE_DIR', cache_dir),
+            ('SIMILARITY_INDEX_PATH', cache_dir / "index.jsonl"),
+        ):
+            patcher = mock.patch.object(self.module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        import huggingface_hub
+        patcher = mock.patch.object(huggingface_hub, 'AsyncInferenceClient', FakeAsyncInferenceClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def run_batch(self, entries, **kwargs):
+        """Run generate_image_batch, failing the test instead of hanging if it never returns."""
+        outcome = {}
+        
+        def target():
+            try:
+                self.module.generate_image_batch(entries, 'test-token', **kwargs)
+            except BaseException as e:
+                outcome['error'] = e
+        
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(BATCH_TIMEOUT_SECONDS)
+        self.assertFalse(thread.is_alive(), "generate_image_batch did not finish (deadlock?)")
+        return outcome.get('error')
+    
+    def test_failing_entry_does_not_stop_the_others(self):
+        entries = [
+            {'title': 'A', 'content': 'first', 'output': 'a.png'},
+            {'title': 'B', 'content': 'missing output'},
+            {'title': 'C', 'content': 'third', 'output': 'c.png'},
+        ]
+        
+        error = self.run_batch(entries)
+        
+        self.assertIsInstance(error, self.module.ImageGenerationError)
+        self.assertIn("1 of 3", str(error))
+        self.assertTrue((self.images_dir / "a.png").exists())
+        self.assertTrue((self.images_dir / "c.png").exists())
+
+    
+    def test_failing_entry_does_not_stop_the_others_without_aiohttp(self):
+        entries = [
+            {'title': 'A', 'content': 'first', 'output': 'a.png'},
+            {'title': 'B', 'content': 'missing output'},
+            {'title': 'C', 'content': 'third', 'output': 'c.png'},
+        ]
+        
+        # Force the thread-pool fallback used when aiohttp is not installed
+        find_spec = importlib.util.find_spec
+        with mock.patch.object(self.module, 'get_client', lambda *args, **kwargs: FakeInferenceClient()), \
+                mock.patch.object(
+                    self.module.importlib.util, 'find_spec',
+                    lambda name, *args: None if name == 'aiohttp' else find_spec(name, *args)
+                ):
+            error = self.run_batch(entries)
+        
+        self.assertIsInstance(error, self.module.ImageGenerationError)
+        self.assertIn("1 of 3", str(error))
+        self.assertTrue((self.images_dir / "a.png").exists())
+        self.assertTrue((self.images_dir / "c.png").exists())
+
+
+@unittest.skipIf(MISSING_DEPENDENCIES, f"missing packages: {', '.join(MISSING_DEPENDENCIES)}")
+class LoadManifestTests(unittest.TestCase):
+    
+    def setUp(self):
+        self.module = load_script()
+    
+    def load(self, content):
+        """Write content to a temporary manifest file and load it."""
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(content, f)
+        self.addCleanup(Path(f.name).unlink)
+        return self.module.load_manifest(f.name)
+    
+    def test_valid_manifest_is_returned(self):
+        entries = [{'title': 'A', 'content': 'c', 'output': 'a.png', 'scene': 'a desk'}]
+        self.assertEqual(self.load(entries), entries)
+    
+    def test_rejects_entries_that_are_not_objects(self):
+        with self.assertRaisesRegex(self.module.ImageGenerationError, "Manifest entry 0 must be an object"):
+            self.load(["x"])
+    
+    def test_rejects_missing_fields(self):
+        with self.assertRaisesRegex(self.module.ImageGenerationError, "Manifest entry 0 is missing: output"):
+            self.load([{'title': 'A', 'content': 'c'}])
+    
+    def test_rejects_non_string_fields(self):
+        with self.assertRaisesRegex(self.module.ImageGenerationError, "Manifest entry 1 must use strings for: title, scene"):
+            self.load([
+                {'title': 'A', 'content': 'c', 'output': 'a.png'},
+                {'title': 2024, 'content': 'c', 'output': 'b.png', 'scene': 5},
+            ])
+
+
+@unittest.skipIf(MISSING_DEPENDENCIES, f"missing packages: {', '.join(MISSING_DEPENDENCIES)}")
+class ConstructImagePromptTests(unittest.TestCase):
+    
+    def setUp(self):
+        self.module = load_script()
+    
+    def test_matches_template_formatting(self):
+        self.assertEqual(
+            self.module.construct_image_prompt('Title {x}', 'Theme'),
+            self.module.GENERIC_PROMPT_TEMPLATE.format(title='Title {x}', content='Theme')
+        )
+        self.assertEqual(
+            self.module.construct_image_prompt('Title', 'Theme', 'A desk {y}'),
+            self.module.SCENE_PROMPT_TEMPLATE.format(scene='A desk {y}')
+        )
+    
+    def test_accepts_non_string_values(self):
+        self.assertIn("Post Title: 2024\n", self.module.construct_image_prompt(2024, 'Theme'))
+        self.assertIn("Scene: 5\n", self.module.construct_image_prompt('Title', 'Theme', 5))
+
+
+@unittest.skipIf(MISSING_DEPENDENCIES, f"missing packages: {', '.join(MISSING_DEPENDENCIES)}")
+class TransientErrorTests(unittest.TestCase):
+    
+    def setUp(self):
+        self.module = load_script()
+    
+    def test_timeouts_are_not_retried(self):
+        import aiohttp
+        from huggingface_hub import InferenceTimeoutError
+        for error in (InferenceTimeoutError("timed out"), asyncio.TimeoutError(),
+                      aiohttp.ServerTimeoutError()):
+            self.assertFalse(self.module.is_transient_error(error), repr(error))
+    
+    def test_dropped_connections_are_retried(self):
+        import aiohttp
+        for error in (ConnectionResetError(), aiohttp.ServerDisconnectedError(),
+                      aiohttp.ClientPayloadError()):
+            self.assertTrue(self.module.is_transient_error(error), repr(error))
+
+
+if __name__ == '__main__':
+    unittest.main()